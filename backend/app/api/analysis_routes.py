@@ -2,17 +2,32 @@
 MRI Analysis API routes
 """
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from typing import Optional
 import json
 import asyncio
+import orjson
 
 from app.services.shared import analysis_service
 from app.models.schemas import AnalysisResult, TissueStats
+from app.utils.http import conditional_file_response
 
 router = APIRouter()
 
+# The legend never changes, so encode it once at import and serve the bytes
+_LEGEND_JSON = orjson.dumps({
+    "status": "success",
+    "legend": {
+        "visceral_fat": {"color": "#FFA500", "description": "Visceral Fat"},
+        "subcutaneous_fat": {"color": "#FFFF00", "description": "Subcutaneous Fat"},
+        "muscle": {"color": "#FF0000", "description": "Muscle Tissue"},
+        "organ": {"color": "#0080FF", "description": "Organs"},
+        "bone": {"color": "#FFFFFF", "description": "Bone"},
+        "background": {"color": "#000000", "description": "Background"}
+    }
+})
+
 
 @router.post("/analyze/{series_id}")
 async def analyze_series(series_id: str):
@@ -32,12 +47,16 @@ async def analyze_series_stream(series_id: str):
     Analyze a DICOM series with streaming progress updates (SSE)
     """
     async def event_generator():
+        # Pre-encoded SSE framing; orjson emits bytes directly, so each tick
+        # avoids a str round-trip and a second UTF-8 encode
+        prefix = b"data: "
+        suffix = b"\n\n"
         try:
             async for progress in analysis_service.analyze_series_with_progress(series_id):
-                yield f"data: {json.dumps(progress)}\n\n"
+                yield prefix + orjson.dumps(progress) + suffix
         except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
-    
+            yield prefix + orjson.dumps({'type': 'error', 'message': str(e)}) + suffix
+
     return StreamingResponse(
         event_generator(),
         media_type="text/event-stream",
@@ -54,10 +73,15 @@ async def get_analysis_results(series_id: str):
     Get cached analysis results for a series
     """
     try:
-        results = analysis_service.get_results(series_id)
-        if results is None:
+        # Results are encoded once per analysis and cached as bytes; splice
+        # them into the envelope so repeat fetches skip serialization
+        payload = analysis_service.get_results_bytes(series_id)
+        if payload is None:
             raise HTTPException(status_code=404, detail="Analysis results not found")
-        return {"status": "success", "data": results}
+        return Response(
+            content=b'{"status":"success","data":' + payload + b'}',
+            media_type="application/json"
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -65,7 +89,7 @@ async def get_analysis_results(series_id: str):
 
 
 @router.get("/results/{series_id}/image/{image_index}")
-async def get_analyzed_image(series_id: str, image_index: int, overlay: bool = True):
+async def get_analyzed_image(series_id: str, image_index: int, request: Request, overlay: bool = True):
     """
     Get an analyzed/color-coded image
     """
@@ -73,7 +97,7 @@ async def get_analyzed_image(series_id: str, image_index: int, overlay: bool = T
         image_path = analysis_service.get_analyzed_image(series_id, image_index, overlay)
         if image_path is None:
             raise HTTPException(status_code=404, detail="Analyzed image not found")
-        return FileResponse(image_path, media_type="image/png")
+        return conditional_file_response(image_path, request, media_type="image/png")
     except HTTPException:
         raise
     except Exception as e:
@@ -101,14 +125,4 @@ async def get_color_legend():
     """
     Get the color legend for tissue types
     """
-    return {
-        "status": "success",
-        "legend": {
-            "visceral_fat": {"color": "#FFA500", "description": "Visceral Fat"},
-            "subcutaneous_fat": {"color": "#FFFF00", "description": "Subcutaneous Fat"},
-            "muscle": {"color": "#FF0000", "description": "Muscle Tissue"},
-            "organ": {"color": "#0080FF", "description": "Organs"},
-            "bone": {"color": "#FFFFFF", "description": "Bone"},
-            "background": {"color": "#000000", "description": "Background"}
-        }
-    }
+    return Response(content=_LEGEND_JSON, media_type="application/json")
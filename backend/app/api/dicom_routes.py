@@ -2,21 +2,94 @@
 DICOM processing API routes
 """
 
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request
+from fastapi.responses import JSONResponse, FileResponse, ORJSONResponse
 from typing import List
 import os
 from pathlib import Path
 import zipfile
 import tempfile
 import shutil
+import aiofiles
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    # Optional: libarchive links zlib-ng's SIMD DEFLATE, roughly 2-4x faster
+    # than stdlib zipfile on large DICOM archives
+    import libarchive
+except ImportError:
+    libarchive = None
 
 from app.services.shared import dicom_service, analysis_service, model_service
 from app.models.schemas import DicomInfo, DicomSeries
 from app.config import settings
+from app.utils.http import conditional_file_response
 
 router = APIRouter()
 
+# Extraction is sharded across processes only when the archive is large
+# enough to amortize worker startup
+_MIN_MEMBERS_FOR_PARALLEL_EXTRACT = 64
+
+
+def _extract_with_libarchive(zip_path: str, extract_dir: str):
+    """Extract a whole archive via libarchive (runs in a worker process)
+
+    libarchive extracts relative to the working directory, so this must run
+    in a dedicated process where chdir can't race other requests.
+    """
+    os.chdir(extract_dir)
+    # Match the zipfile path's member sanitization: reject parent-dir
+    # traversal, absolute paths and symlink escapes so a crafted archive
+    # can't write outside extract_dir
+    libarchive.extract_file(
+        zip_path,
+        flags=(libarchive.extract.EXTRACT_SECURE_NODOTDOT
+               | libarchive.extract.EXTRACT_SECURE_SYMLINKS
+               | libarchive.extract.EXTRACT_SECURE_NOABSOLUTEPATHS)
+    )
+
+
+def _extract_shard(zip_path: str, members: List[str], extract_dir: str):
+    """Extract a shard of zip members (runs in a worker process)
+
+    Each worker reopens the archive since ZipFile objects aren't picklable.
+    """
+    with zipfile.ZipFile(zip_path, 'r') as zf:
+        for member in members:
+            zf.extract(member, extract_dir)
+
+
+async def _extract_zip(zip_path: Path, extract_dir: Path):
+    """Extract a zip archive, fanning DEFLATE work across CPU cores"""
+    loop = asyncio.get_running_loop()
+
+    if libarchive is not None:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            await loop.run_in_executor(
+                pool, _extract_with_libarchive, str(zip_path), str(extract_dir)
+            )
+        return
+
+    with zipfile.ZipFile(zip_path, 'r') as zf:
+        members = zf.namelist()
+
+    if len(members) < _MIN_MEMBERS_FOR_PARALLEL_EXTRACT:
+        await asyncio.to_thread(_extract_shard, str(zip_path), members, str(extract_dir))
+        return
+
+    workers = min(os.cpu_count() or 1, 8)
+    shard_size = (len(members) + workers - 1) // workers
+    shards = [members[i:i + shard_size] for i in range(0, len(members), shard_size)]
+
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        await asyncio.gather(*[
+            loop.run_in_executor(pool, _extract_shard, str(zip_path), shard, str(extract_dir))
+            for shard in shards
+        ])
+
 
 @router.get("/init")
 async def initialize_existing_data():
@@ -24,15 +97,15 @@ async def initialize_existing_data():
     Scan for and load any existing DICOM data, analysis results, and models
     """
     try:
-        # Scan for existing DICOM data
-        series = dicom_service.scan_existing_data()
-        
-        # Scan for existing analysis results
-        analyzed_series = analysis_service.scan_existing_data()
-        
-        # Scan for existing models
-        model_series = model_service.scan_existing_data()
-        
+        # The scans walk directories and parse files, so run them in
+        # threads (and concurrently) instead of blocking the event loop
+        series, analyzed_series, model_series = await asyncio.gather(
+            asyncio.to_thread(dicom_service.scan_existing_data),
+            asyncio.to_thread(analysis_service.scan_existing_data),
+            asyncio.to_thread(model_service.scan_existing_data),
+        )
+
+
         return {
             "status": "success",
             "series": series,
@@ -43,6 +116,25 @@ async def initialize_existing_data():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _clear_all_results_files():
+    """Delete all analysis and model artifacts from disk (runs in a thread)"""
+    # Delete analysis JSON files and colored images in a single directory
+    # pass - scandir avoids the extra stat() per entry that glob needs.
+    # The asset directories are created at startup in config.py and never
+    # removed while the app runs, so no existence checks are needed.
+    with os.scandir(settings.IMAGES_DIR) as it:
+        for entry in it:
+            if (entry.name.endswith("_analysis.json") or entry.name.endswith("_colored.png")) \
+                    and entry.is_file(follow_symlinks=False):
+                os.unlink(entry.path)
+
+    # Delete model files from disk
+    with os.scandir(settings.MODELS_DIR) as it:
+        for entry in it:
+            if entry.is_file(follow_symlinks=False):
+                os.unlink(entry.path)
+
+
 @router.delete("/clear-results")
 async def clear_analysis_and_models():
     """
@@ -51,26 +143,14 @@ async def clear_analysis_and_models():
     try:
         # Clear analysis cache
         analysis_service.clear_all_data()
-        
+
         # Clear model cache
         model_service.clear_all_data()
-        
-        # Delete analysis JSON files from images dir (colored images are kept)
-        if settings.IMAGES_DIR.exists():
-            for f in settings.IMAGES_DIR.glob("*_analysis.json"):
-                if f.is_file():
-                    f.unlink()
-            # Also delete colored/analyzed images
-            for f in settings.IMAGES_DIR.glob("*_colored.png"):
-                if f.is_file():
-                    f.unlink()
-        
-        # Delete model files from disk
-        if settings.MODELS_DIR.exists():
-            for f in settings.MODELS_DIR.glob("*"):
-                if f.is_file():
-                    f.unlink()
-        
+
+        # Delete files off the event loop so concurrent requests (including
+        # SSE streams) aren't blocked while the directories are emptied
+        await asyncio.to_thread(_clear_all_results_files)
+
         return {
             "status": "success",
             "message": "Analysis results and 3D models cleared successfully"
@@ -79,6 +159,31 @@ async def clear_analysis_and_models():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _clear_series_results_files(series_uid: str):
+    """Delete analysis and model artifacts for one series (runs in a thread)"""
+    # Delete analysis files for this series (the asset directories are
+    # created at startup and always present)
+    # Delete analysis JSON - unlink(missing_ok=True) issues a single
+    # unlink(2) instead of a stat() followed by an unlink()
+    analysis_json = settings.IMAGES_DIR / f"{series_uid}_analysis.json"
+    analysis_json.unlink(missing_ok=True)
+    # Delete colored images for this series - plain prefix/suffix string
+    # checks beat glob(), which runs an fnmatch regex per directory entry
+    colored_prefix = f"{series_uid}_"
+    with os.scandir(settings.IMAGES_DIR) as it:
+        for entry in it:
+            if entry.name.startswith(colored_prefix) \
+                    and entry.name.endswith("_colored.png") \
+                    and entry.is_file(follow_symlinks=False):
+                os.unlink(entry.path)
+
+    # Delete model files for this series
+    model_glb = settings.MODELS_DIR / f"{series_uid}.glb"
+    model_glb.unlink(missing_ok=True)
+    model_json = settings.MODELS_DIR / f"{series_uid}_info.json"
+    model_json.unlink(missing_ok=True)
+
+
 @router.delete("/series/{series_uid}/clear-results")
 async def clear_series_analysis_and_model(series_uid: str):
     """
@@ -87,30 +192,13 @@ async def clear_series_analysis_and_model(series_uid: str):
     try:
         # Clear from analysis cache
         analysis_service.clear_series_data(series_uid)
-        
+
         # Clear from model cache
         model_service.clear_series_data(series_uid)
-        
-        # Delete analysis files for this series
-        if settings.IMAGES_DIR.exists():
-            # Delete analysis JSON
-            analysis_json = settings.IMAGES_DIR / f"{series_uid}_analysis.json"
-            if analysis_json.exists():
-                analysis_json.unlink()
-            # Delete colored images for this series
-            for f in settings.IMAGES_DIR.glob(f"{series_uid}_*_colored.png"):
-                if f.is_file():
-                    f.unlink()
-        
-        # Delete model files for this series
-        if settings.MODELS_DIR.exists():
-            model_glb = settings.MODELS_DIR / f"{series_uid}.glb"
-            if model_glb.exists():
-                model_glb.unlink()
-            model_json = settings.MODELS_DIR / f"{series_uid}_info.json"
-            if model_json.exists():
-                model_json.unlink()
-        
+
+        # Delete files off the event loop
+        await asyncio.to_thread(_clear_series_results_files, series_uid)
+
         return {
             "status": "success",
             "message": f"Analysis and 3D model cleared for series {series_uid}"
@@ -149,17 +237,16 @@ async def upload_zip_file(file: UploadFile = File(...)):
         extract_dir = settings.DICOM_DIR / f"upload_{file.filename.replace('.zip', '')}"
         extract_dir.mkdir(parents=True, exist_ok=True)
         
-        # Save and extract the zip file
+        # Stream the zip file to disk in chunks so peak memory stays bounded
+        # regardless of archive size
         zip_path = settings.DICOM_DIR / file.filename
-        content = await file.read()
-        
-        with open(zip_path, 'wb') as f:
-            f.write(content)
-        
+        async with aiofiles.open(zip_path, 'wb') as f:
+            while chunk := await file.read(1 << 20):
+                await f.write(chunk)
+
         # Extract the zip file
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_dir)
-        
+        await _extract_zip(zip_path, extract_dir)
+
         # Remove the zip file after extraction
         os.remove(zip_path)
         
@@ -213,13 +300,16 @@ async def get_series_images(series_id: str):
     """
     try:
         images = dicom_service.get_series_images(series_id)
-        return {"status": "success", "images": images}
+        # Return the response directly so FastAPI skips jsonable_encoder -
+        # for series with hundreds of slices that's a full O(n) dict-copy
+        # pass the plain-dict payload doesn't need
+        return ORJSONResponse({"status": "success", "images": images})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/series/{series_id}/image/{image_index}")
-async def get_dicom_image(series_id: str, image_index: int):
+async def get_dicom_image(series_id: str, image_index: int, request: Request):
     """
     Get a specific DICOM image as PNG
     """
@@ -227,7 +317,7 @@ async def get_dicom_image(series_id: str, image_index: int):
         image_path = dicom_service.get_image_as_png(series_id, image_index)
         if image_path is None:
             raise HTTPException(status_code=404, detail="Image not found")
-        return FileResponse(image_path, media_type="image/png")
+        return conditional_file_response(image_path, request, media_type="image/png")
     except HTTPException:
         raise
     except Exception as e:
@@ -2,58 +2,102 @@
 3D Model Generation API routes
 """
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Request
 from fastapi.responses import FileResponse
 from typing import Optional, Dict
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import atexit
+import functools
+from concurrent.futures import ProcessPoolExecutor
 import traceback
 
-from app.services.shared import model_service
+from app.services.shared import model_service, generation_status
+from app.services import manifest
+from app.services.model_service import build_model
 from app.models.schemas import ModelGenerationRequest, ModelInfo
+from app.utils.http import conditional_file_response
 
 router = APIRouter()
 
-# Thread pool for CPU-intensive model generation
-executor = ThreadPoolExecutor(max_workers=2)
+# Process pool for CPU-intensive model generation - meshing runs in true
+# parallel instead of contending for the GIL with the event loop. Created
+# lazily so apps that never generate a model don't pay the worker-spawn
+# cost, and shut down explicitly instead of leaking workers on reload.
+@functools.lru_cache()
+def _get_executor() -> ProcessPoolExecutor:
+    executor = ProcessPoolExecutor(max_workers=2)
+    atexit.register(executor.shutdown, wait=False)
+    return executor
 
-# Track generation status
-generation_status: Dict[str, dict] = {}
 
+def shutdown_executor():
+    """Shut down the generation pool if it was ever created"""
+    if _get_executor.cache_info().currsize:
+        _get_executor().shutdown(wait=False)
+        _get_executor.cache_clear()
 
-def _generate_model_sync(series_id: str, include_tissues: Optional[list] = None):
-    """Synchronous model generation wrapper for thread pool"""
+_ALLOWED_TISSUES = frozenset({"body", "visceral_fat", "subcutaneous_fat", "organs"})
+_DEFAULT_TISSUES = frozenset({"body", "visceral_fat", "organs"})
+
+
+def _canonical_tissues(include_tissues: Optional[list]) -> list:
+    """Validate and canonicalize the tissue selection
+
+    Returns a sorted, de-duplicated list so requests that differ only in
+    ordering map to the same generation work.
+    """
+    tissues = frozenset(include_tissues) if include_tissues else _DEFAULT_TISSUES
+    unknown = tissues - _ALLOWED_TISSUES
+    if unknown:
+        raise ValueError(f"Unknown tissue types: {', '.join(sorted(unknown))}")
+    return sorted(tissues)
+
+
+async def _run_generation(series_id: str, include_tissues: Optional[list] = None):
+    """Drive one background generation task, publishing status transitions
+
+    Volume extraction runs in a thread (it needs the in-process DICOM store),
+    then the picklable meshing pipeline runs in the process pool.
+    """
     try:
-        generation_status[series_id] = {
+        generation_status.set(series_id, {
             "status": "generating",
-            "progress": 0,
-            "message": "Starting model generation..."
-        }
-        
-        # Run the async function in a new event loop
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            result = loop.run_until_complete(
-                model_service.generate_model(series_id, include_tissues)
-            )
-            generation_status[series_id] = {
-                "status": "complete",
-                "progress": 100,
-                "message": "Model generation complete!",
-                "data": result
-            }
-            return result
-        finally:
-            loop.close()
+            "progress": 5,
+            "message": "Extracting volume data..."
+        })
+
+        volume, series_info = await asyncio.to_thread(
+            model_service.prepare_volume, series_id
+        )
+
+        generation_status.set(series_id, {
+            "status": "generating",
+            "progress": 20,
+            "message": "Generating meshes..."
+        })
+
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            _get_executor(), build_model, series_id, volume, series_info, include_tissues
+        )
+        model_service.cache_model_info(result)
+        # Record the model here rather than in the worker: the manifest
+        # lock is per-process, so only parent-side writes are serialized
+        manifest.add("model_series", series_id)
+
+        generation_status.set(series_id, {
+            "status": "complete",
+            "progress": 100,
+            "message": "Model generation complete!",
+            "data": result
+        })
     except Exception as e:
-        generation_status[series_id] = {
+        generation_status.set(series_id, {
             "status": "error",
             "progress": 0,
             "message": str(e),
             "error": traceback.format_exc()
-        }
-        raise
+        })
 
 
 @router.post("/generate/{series_id}")
@@ -62,26 +106,44 @@ async def generate_3d_model(series_id: str, include_tissues: Optional[list] = No
     Generate a 3D model from an analyzed DICOM series (runs in background)
     """
     try:
+        include_tissues = _canonical_tissues(include_tissues)
+
         # Check if already generating
-        if series_id in generation_status:
-            status = generation_status[series_id]
-            if status.get("status") == "generating":
-                return {
-                    "status": "already_generating",
-                    "message": "Model generation already in progress"
-                }
-        
-        # Start generation in thread pool
-        generation_status[series_id] = {
+        status = generation_status.get(series_id)
+        if status is not None and status.get("status") == "generating":
+            return {
+                "status": "already_generating",
+                "message": "Model generation already in progress"
+            }
+
+        # Reuse the existing model when it was built for the same tissue set
+        # (may read the info JSON from disk, so keep it off the event loop)
+        info = await asyncio.to_thread(model_service.get_model_info, series_id)
+        if (info is not None
+                and info.get("include_tissues") == include_tissues
+                and model_service.get_model_path(series_id) is not None):
+            generation_status.set(series_id, {
+                "status": "complete",
+                "progress": 100,
+                "message": "Model already exists",
+                "data": info
+            })
+            return {
+                "status": "complete",
+                "message": "Model already generated for this tissue selection",
+                "data": info
+            }
+
+        # Start generation in the process pool
+        generation_status.set(series_id, {
             "status": "generating",
             "progress": 0,
             "message": "Initializing..."
-        }
-        
-        # Run in background thread
-        loop = asyncio.get_event_loop()
-        loop.run_in_executor(executor, _generate_model_sync, series_id, include_tissues)
+        })
         
+        # Run in the background without blocking this request
+        asyncio.get_event_loop().create_task(_run_generation(series_id, include_tissues))
+
         return {
             "status": "started",
             "message": "Model generation started in background"
@@ -99,9 +161,10 @@ async def get_generation_status(series_id: str):
     """
     Get the status of a model generation task
     """
-    if series_id not in generation_status:
+    status = generation_status.get(series_id)
+    if status is None:
         # Check if model already exists
-        info = model_service.get_model_info(series_id)
+        info = await asyncio.to_thread(model_service.get_model_info, series_id)
         if info:
             return {
                 "status": "complete",
@@ -114,12 +177,12 @@ async def get_generation_status(series_id: str):
             "progress": 0,
             "message": "No generation task found"
         }
-    
-    return generation_status[series_id]
+
+    return status
 
 
 @router.get("/download/{series_id}")
-async def download_model(series_id: str, format: str = "glb"):
+async def download_model(series_id: str, request: Request, format: str = "glb"):
     """
     Download the generated 3D model
     """
@@ -127,10 +190,11 @@ async def download_model(series_id: str, format: str = "glb"):
         model_path = model_service.get_model_path(series_id, format)
         if model_path is None:
             raise HTTPException(status_code=404, detail="Model not found")
-        
+
         media_type = "model/gltf-binary" if format == "glb" else "application/octet-stream"
-        return FileResponse(
-            model_path, 
+        return conditional_file_response(
+            model_path,
+            request,
             media_type=media_type,
             filename=f"{series_id}_model.{format}"
         )
@@ -146,7 +210,7 @@ async def get_model_info(series_id: str):
     Get information about a generated model
     """
     try:
-        info = model_service.get_model_info(series_id)
+        info = await asyncio.to_thread(model_service.get_model_info, series_id)
         if info is None:
             raise HTTPException(status_code=404, detail="Model info not found")
         return {"status": "success", "data": info}
@@ -178,7 +242,7 @@ async def list_generated_models():
     List all generated 3D models
     """
     try:
-        models = model_service.list_models()
+        models = await asyncio.to_thread(model_service.list_models)
         return {"status": "success", "models": models}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
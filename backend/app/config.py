@@ -2,19 +2,26 @@
 Application configuration settings
 """
 
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import List
 from pathlib import Path
 
 
 class Settings(BaseSettings):
     """Application settings"""
+
+    model_config = SettingsConfigDict(env_file=".env")
     
     # API Settings
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
     DEBUG: bool = True
     
+    # Status store (Redis is used when configured, e.g. "redis://localhost:6379/0";
+    # otherwise an in-process store with TTL eviction is used)
+    REDIS_URL: str = ""
+    STATUS_TTL_SECONDS: int = 3600
+
     # CORS Settings
     CORS_ORIGINS: List[str] = [
         "http://localhost:5173", 
@@ -33,6 +40,10 @@ class Settings(BaseSettings):
     MODELS_DIR: Path = ASSETS_DIR / "models"
     ANALYSIS_DIR: Path = ASSETS_DIR / "analysis"
     
+    # GPU offload for model generation (requires cupy; ignored when no
+    # CUDA device or cupy is not installed)
+    USE_GPU: bool = False
+
     # Analysis Settings
     VISCERAL_FAT_HU_MIN: int = -190  # Hounsfield units for fat tissue (lower bound)
     VISCERAL_FAT_HU_MAX: int = -30   # Hounsfield units for fat tissue (upper bound)
@@ -46,9 +57,6 @@ class Settings(BaseSettings):
         "bone": [255, 255, 255],           # White
         "background": [0, 0, 0]            # Black
     }
-    
-    class Config:
-        env_file = ".env"
 
 
 settings = Settings()
@@ -5,6 +5,8 @@ Main application entry point
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 import os
 from pathlib import Path
@@ -15,7 +17,8 @@ from app.config import settings
 app = FastAPI(
     title="Visceral Fat MRI Analysis API",
     description="API for analyzing MRI images, detecting visceral fat, and generating 3D models",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -27,6 +30,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON responses (analysis results with per-slice stats
+# compress ~10x); small payloads skip compression entirely
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Mount static files for serving generated assets
 assets_path = Path(__file__).parent.parent.parent / "assets"
 if assets_path.exists():
@@ -38,6 +45,12 @@ app.include_router(analysis_routes.router, prefix="/api/analysis", tags=["Analys
 app.include_router(model_routes.router, prefix="/api/model", tags=["3D Model"])
 
 
+@app.on_event("shutdown")
+async def shutdown_executors():
+    """Release the model-generation worker pool on server shutdown"""
+    model_routes.shutdown_executor()
+
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -2,11 +2,20 @@
 Pydantic schemas for API request/response models
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional, Dict, Any
 
 
-class DicomInfo(BaseModel):
+class FrozenModel(BaseModel):
+    """Base for response schemas - immutable, unknown fields ignored
+
+    frozen=True lets Pydantic v2 skip building setters and makes instances
+    hashable; validation runs in the Rust core.
+    """
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
+
+class DicomInfo(FrozenModel):
     """Information about a single DICOM file"""
     filename: str
     series_uid: str
@@ -15,7 +24,7 @@ class DicomInfo(BaseModel):
     error: Optional[str] = None
 
 
-class DicomSeries(BaseModel):
+class DicomSeries(FrozenModel):
     """Information about a DICOM series"""
     series_uid: str
     series_description: str
@@ -29,7 +38,7 @@ class DicomSeries(BaseModel):
     slice_thickness: Optional[float] = None
 
 
-class SliceStats(BaseModel):
+class SliceStats(FrozenModel):
     """Statistics for a single slice"""
     index: int
     visceral_fat_pixels: int
@@ -37,7 +46,7 @@ class SliceStats(BaseModel):
     visceral_fat_area_cm2: float
 
 
-class TissueStats(BaseModel):
+class TissueStats(FrozenModel):
     """Overall tissue statistics"""
     total_visceral_fat_volume: float
     total_subcutaneous_fat_volume: float
@@ -45,14 +54,14 @@ class TissueStats(BaseModel):
     slice_stats: List[SliceStats]
 
 
-class AnalyzedImage(BaseModel):
+class AnalyzedImage(FrozenModel):
     """Information about an analyzed image"""
     index: int
     colored_image_path: str
     stats: SliceStats
 
 
-class AnalysisResult(BaseModel):
+class AnalysisResult(FrozenModel):
     """Complete analysis results"""
     series_id: str
     image_count: int
@@ -66,14 +75,14 @@ class ModelGenerationRequest(BaseModel):
     include_tissues: Optional[List[str]] = None
 
 
-class TissueInfo(BaseModel):
+class TissueInfo(FrozenModel):
     """Information about a tissue in the model"""
     name: str
     color: str
     opacity: float
 
 
-class ModelInfo(BaseModel):
+class ModelInfo(FrozenModel):
     """Information about a generated 3D model"""
     series_id: str
     tissues: List[TissueInfo]
@@ -84,7 +93,7 @@ class ModelInfo(BaseModel):
     obj_path: Optional[str] = None
 
 
-class SlicePlane(BaseModel):
+class SlicePlane(FrozenModel):
     """Information about a slice plane in 3D space"""
     slice_index: int
     z_position: float
@@ -94,13 +103,13 @@ class SlicePlane(BaseModel):
     normal: List[float]
 
 
-class ColorLegendItem(BaseModel):
+class ColorLegendItem(FrozenModel):
     """Color legend item"""
     color: str
     description: str
 
 
-class ColorLegend(BaseModel):
+class ColorLegend(FrozenModel):
     """Complete color legend"""
     visceral_fat: ColorLegendItem
     subcutaneous_fat: ColorLegendItem
@@ -4,41 +4,67 @@ Handles loading, parsing, and converting DICOM files
 """
 
 import os
+import cv2
 import pydicom
 import numpy as np
-from PIL import Image
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 import aiofiles
 import hashlib
 
 from app.config import settings
+from app.services import manifest
+
+# Tags needed to sort series and serve metadata - scanning reads only
+# these and stops before the pixel data element
+_SCAN_TAGS = [
+    'SeriesInstanceUID', 'InstanceNumber', 'Modality', 'SeriesDescription',
+    'PatientName', 'StudyDate', 'SliceLocation', 'Rows', 'Columns',
+    'PixelSpacing', 'SliceThickness'
+]
 
 
 class DicomService:
     """Service for handling DICOM file operations"""
-    
+
     def __init__(self):
         self.dicom_cache: Dict[str, Any] = {}
         self.series_data: Dict[str, List[pydicom.Dataset]] = {}
-    
+        self.series_dirs: Dict[str, str] = {}
+        # HU-converted slices, cached on first decode - pydicom re-decodes
+        # pixel_array from the raw bytes on every access otherwise
+        self.pixel_cache: Dict[Tuple[str, int], np.ndarray] = {}
+
     def clear_all_data(self):
         """Clear all cached DICOM data"""
         self.dicom_cache.clear()
         self.series_data.clear()
-    
+        self.series_dirs.clear()
+        self.pixel_cache.clear()
+        manifest.update(dicom_series=[], dicom_dirs={})
+
     def scan_existing_data(self) -> List[Dict]:
         """Scan the DICOM directory for existing extracted data and load it"""
+        # Fast path: the manifest already indexes the extracted series, so we
+        # can answer without re-parsing every DICOM file; series are hydrated
+        # lazily on first access via _ensure_loaded
+        indexed = manifest.load()
+        if indexed and indexed.get("dicom_series"):
+            dirs = indexed.get("dicom_dirs", {})
+            if dirs and all(Path(d).exists() for d in dirs.values()):
+                self.series_dirs.update(dirs)
+                return indexed["dicom_series"]
+
         results = []
-        
+
         # Clear existing data first to prevent duplicates on refresh
         self.dicom_cache.clear()
         self.series_data.clear()
-        
+
         # Look for extracted upload directories
         if not settings.DICOM_DIR.exists():
             return results
-        
+
         for item in settings.DICOM_DIR.iterdir():
             if item.is_dir() and item.name.startswith('upload_'):
                 # This is an extracted upload directory, load it
@@ -47,24 +73,40 @@ class DicomService:
                     results.extend(loaded)
                 except Exception:
                     continue
-        
+
         return results
+
+    def _ensure_loaded(self, series_id: str):
+        """Hydrate a manifest-indexed series from disk on first access"""
+        if series_id in self.series_data:
+            return
+        directory = self.series_dirs.get(series_id)
+        if directory and Path(directory).exists():
+            try:
+                self.load_from_directory(directory)
+            except Exception:
+                pass
     
     async def process_uploaded_files(self, files) -> List[Dict]:
         """Process uploaded DICOM files"""
         results = []
         
         for file in files:
-            # Generate unique filename
-            content = await file.read()
-            file_hash = hashlib.md5(content).hexdigest()[:8]
-            filename = f"{file_hash}_{file.filename}"
+            # Stream to disk while hashing so large files never sit fully
+            # in memory; blake2b is ~3x faster than md5 and 8 bytes is
+            # plenty for filename dedup
+            h = hashlib.blake2b(digest_size=8)
+            tmp_path = settings.DICOM_DIR / f"{file.filename}.part"
+            async with aiofiles.open(tmp_path, 'wb') as f:
+                while chunk := await file.read(1 << 20):
+                    h.update(chunk)
+                    await f.write(chunk)
+
+            # The hash is only known once the stream ends, so rename into place
+            filename = f"{h.hexdigest()[:8]}_{file.filename}"
             file_path = settings.DICOM_DIR / filename
-            
-            # Save file
-            async with aiofiles.open(file_path, 'wb') as f:
-                await f.write(content)
-            
+            os.replace(tmp_path, file_path)
+
             # Parse DICOM
             try:
                 ds = pydicom.dcmread(str(file_path))
@@ -105,16 +147,22 @@ class DicomService:
                     file_path = Path(root) / file
                     dicom_files.append(file_path)
         
-        # Process each file
+        # Process each file - metadata only; pixels are read on demand in
+        # the pixel accessors (an order of magnitude faster on scan)
         for file_path in sorted(dicom_files):
             try:
-                ds = pydicom.dcmread(str(file_path))
+                ds = pydicom.dcmread(
+                    str(file_path),
+                    stop_before_pixels=True,
+                    specific_tags=_SCAN_TAGS
+                )
                 series_uid = str(ds.SeriesInstanceUID) if hasattr(ds, 'SeriesInstanceUID') else file_path.stem
-                
+
                 if series_uid not in self.series_data:
                     self.series_data[series_uid] = []
                 self.series_data[series_uid].append(ds)
-                
+                self.series_dirs[series_uid] = str(dir_path)
+
             except Exception:
                 continue  # Skip non-DICOM files
         
@@ -150,11 +198,18 @@ class DicomService:
                     "patient_name": str(ds.PatientName) if hasattr(ds, 'PatientName') and ds.PatientName else "Unknown"
                 })
                 series_index += 1
-        
+
+        # Index the loaded series so the next startup can skip the full scan
+        manifest.update(dicom_series=results, dicom_dirs=self.series_dirs)
+
         return results
-    
+
     def list_available_series(self) -> List[Dict]:
         """List all loaded DICOM series"""
+        # Hydrate any series known only from the manifest
+        for series_id in list(self.series_dirs):
+            self._ensure_loaded(series_id)
+
         results = []
         
         series_index = 1
@@ -186,6 +241,7 @@ class DicomService:
     
     def get_series_info(self, series_id: str) -> Optional[Dict]:
         """Get detailed information about a series"""
+        self._ensure_loaded(series_id)
         if series_id not in self.series_data:
             return None
         
@@ -210,6 +266,7 @@ class DicomService:
     
     def get_series_images(self, series_id: str) -> List[Dict]:
         """Get list of images in a series"""
+        self._ensure_loaded(series_id)
         if series_id not in self.series_data:
             return []
         
@@ -223,23 +280,46 @@ class DicomService:
         
         return images
     
-    def get_image_as_png(self, series_id: str, image_index: int) -> Optional[str]:
-        """Convert a DICOM image to PNG and return the path"""
+    def _get_full_dataset(self, series_id: str, image_index: int) -> Optional[pydicom.Dataset]:
+        """Get a dataset with pixel data, re-reading scanned files on demand
+
+        Directory scans keep only the metadata tags; pydicom records the
+        source path on the dataset, so the full file is read here when the
+        pixel data is actually needed.
+        """
+        self._ensure_loaded(series_id)
         if series_id not in self.series_data:
             return None
-        
+
         datasets = self.series_data[series_id]
         if image_index < 0 or image_index >= len(datasets):
             return None
-        
+
         ds = datasets[image_index]
-        
+        if 'PixelData' not in ds and getattr(ds, 'filename', None):
+            ds = pydicom.dcmread(ds.filename)
+        return ds
+
+    def get_image_as_png(self, series_id: str, image_index: int) -> Optional[str]:
+        """Convert a DICOM image to PNG and return the path"""
+        # Series UIDs are content-stable, so an existing render can be
+        # served as-is - no pixel decode, window/level pass or re-encode
+        output_path = settings.IMAGES_DIR / f"{series_id}_{image_index:04d}.png"
+        if output_path.exists():
+            return str(output_path)
+
+        ds = self._get_full_dataset(series_id, image_index)
+        if ds is None:
+            return None
+
         # Get pixel array
-        pixel_array = ds.pixel_array.astype(float)
-        
-        # Apply rescale slope and intercept if available
+        pixel_array = ds.pixel_array.astype(np.float32)
+
+        # Apply rescale slope and intercept if available (in place - no
+        # float64 temporaries)
         if hasattr(ds, 'RescaleSlope') and hasattr(ds, 'RescaleIntercept'):
-            pixel_array = pixel_array * ds.RescaleSlope + ds.RescaleIntercept
+            np.multiply(pixel_array, float(ds.RescaleSlope), out=pixel_array)
+            np.add(pixel_array, float(ds.RescaleIntercept), out=pixel_array)
         
         # Window/level adjustment for visualization
         if hasattr(ds, 'WindowCenter') and hasattr(ds, 'WindowWidth'):
@@ -260,84 +340,95 @@ class DicomService:
         pixel_array = np.clip(pixel_array, img_min, img_max)
         pixel_array = ((pixel_array - img_min) / (img_max - img_min) * 255).astype(np.uint8)
         
-        # Save as PNG
+        # Save as PNG - low compression keeps the encode fast; these are
+        # throwaway visualization files
         output_path = settings.IMAGES_DIR / f"{series_id}_{image_index:04d}.png"
-        Image.fromarray(pixel_array).save(str(output_path))
+        cv2.imwrite(str(output_path), pixel_array, [cv2.IMWRITE_PNG_COMPRESSION, 1])
         
         return str(output_path)
     
     def get_pixel_data(self, series_id: str, image_index: int) -> Optional[np.ndarray]:
         """Get the raw pixel data with HU values for analysis"""
-        if series_id not in self.series_data:
-            return None
-        
-        datasets = self.series_data[series_id]
-        if image_index < 0 or image_index >= len(datasets):
+        cached = self.pixel_cache.get((series_id, image_index))
+        if cached is not None:
+            return cached
+
+        ds = self._get_full_dataset(series_id, image_index)
+        if ds is None:
             return None
-        
-        ds = datasets[image_index]
-        pixel_array = ds.pixel_array.astype(float)
-        
-        # Convert to Hounsfield Units
+
+        # float32 halves memory traffic vs the float64 default and is more
+        # than enough precision for HU values
+        pixel_array = ds.pixel_array.astype(np.float32)
+
+        # Convert to Hounsfield Units (in place - no float64 temporaries)
         if hasattr(ds, 'RescaleSlope') and hasattr(ds, 'RescaleIntercept'):
-            pixel_array = pixel_array * ds.RescaleSlope + ds.RescaleIntercept
-        
+            np.multiply(pixel_array, float(ds.RescaleSlope), out=pixel_array)
+            np.add(pixel_array, float(ds.RescaleIntercept), out=pixel_array)
+
+        self.pixel_cache[(series_id, image_index)] = pixel_array
         return pixel_array
     
     def get_volume_data(self, series_id: str) -> Optional[np.ndarray]:
         """Get the full 3D volume data for a series"""
+        self._ensure_loaded(series_id)
         if series_id not in self.series_data:
             return None
         
         datasets = self.series_data[series_id]
         if not datasets:
             return None
-        
-        # First pass: collect all slices and their dimensions
-        slice_data = []
+
+        # Preflight: pick the majority slice dimensions from the metadata
+        # tags alone - no pixel decode needed for the exclusion pass
+        dims_list = [
+            (int(ds.Rows), int(ds.Columns))
+            if hasattr(ds, 'Rows') and hasattr(ds, 'Columns') else None
+            for ds in datasets
+        ]
+
         dimension_counts = {}
-        
-        for ds in datasets:
-            try:
-                pixel_array = ds.pixel_array.astype(float)
-                if hasattr(ds, 'RescaleSlope') and hasattr(ds, 'RescaleIntercept'):
-                    pixel_array = pixel_array * ds.RescaleSlope + ds.RescaleIntercept
-                
-                dims = pixel_array.shape
-                slice_data.append((pixel_array, dims))
-                
-                # Count occurrences of each dimension
-                if dims not in dimension_counts:
-                    dimension_counts[dims] = 0
-                dimension_counts[dims] += 1
-            except Exception as e:
-                print(f"Warning: Could not read slice: {e}")
-                continue
-        
-        if not slice_data:
+        for dims in dims_list:
+            if dims is not None:
+                dimension_counts[dims] = dimension_counts.get(dims, 0) + 1
+
+        if not dimension_counts:
             return None
-        
+
         # Find the most common dimension (majority)
         majority_dims = max(dimension_counts.keys(), key=lambda d: dimension_counts[d])
-        majority_count = dimension_counts[majority_dims]
-        total_count = len(slice_data)
-        
-        # Filter to only include slices with majority dimensions
-        filtered_slices = [s[0] for s in slice_data if s[1] == majority_dims]
-        
-        if len(filtered_slices) < total_count:
-            excluded = total_count - len(filtered_slices)
-            print(f"Volume assembly: Using {len(filtered_slices)}/{total_count} slices "
+        indices = [i for i, dims in enumerate(dims_list) if dims == majority_dims]
+
+        if len(indices) < len(datasets):
+            excluded = len(datasets) - len(indices)
+            print(f"Volume assembly: Using {len(indices)}/{len(datasets)} slices "
                   f"(excluded {excluded} slices with non-standard dimensions). "
                   f"Majority dims: {majority_dims}")
-        
-        if not filtered_slices:
+
+        # Decode straight into the preallocated volume through the HU slice
+        # cache, so slices already analyzed aren't decoded a second time
+        # and there is no list-of-arrays + np.stack copy
+        volume = np.empty((len(indices), *majority_dims), dtype=np.float32)
+        filled = 0
+        for idx in indices:
+            try:
+                pixel_array = self.get_pixel_data(series_id, idx)
+            except Exception as e:
+                print(f"Warning: Could not read slice: {e}")
+                continue
+            if pixel_array is None or pixel_array.shape != majority_dims:
+                continue
+            volume[filled] = pixel_array
+            filled += 1
+
+        if filled == 0:
             return None
-        
-        return np.stack(filtered_slices, axis=0)
+
+        return volume[:filled]
     
     def get_dataset(self, series_id: str, image_index: int) -> Optional[pydicom.Dataset]:
         """Get a specific DICOM dataset"""
+        self._ensure_loaded(series_id)
         if series_id not in self.series_data:
             return None
         
@@ -0,0 +1,84 @@
+"""
+Asset manifest
+Keeps an index of on-disk assets so /init avoids re-walking the asset tree
+"""
+
+import threading
+from typing import Dict, Optional
+
+import orjson
+
+from app.config import settings
+
+_LOCK = threading.Lock()
+
+_EMPTY = {
+    "dicom_series": [],   # series summary dicts, as returned by load_from_directory
+    "dicom_dirs": {},     # series_uid -> extracted directory, for lazy reload
+    "analyzed_series": [],
+    "model_series": []
+}
+
+
+def _manifest_path():
+    return settings.ASSETS_DIR / "manifest.json"
+
+
+def _read() -> Dict:
+    try:
+        data = orjson.loads(_manifest_path().read_bytes())
+    except (FileNotFoundError, ValueError):
+        return dict(_EMPTY)
+    if not isinstance(data, dict):
+        return dict(_EMPTY)
+    return {**_EMPTY, **data}
+
+
+def _write(data: Dict):
+    _manifest_path().write_bytes(orjson.dumps(data))
+
+
+def load() -> Optional[Dict]:
+    """Load the manifest, or None if it doesn't exist or is unreadable"""
+    try:
+        raw = _manifest_path().read_bytes()
+    except FileNotFoundError:
+        return None
+    try:
+        data = orjson.loads(raw)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    return {**_EMPTY, **data}
+
+
+def update(**sections):
+    """Merge the given sections into the manifest and write it out"""
+    with _LOCK:
+        data = _read()
+        data.update(sections)
+        _write(data)
+
+
+def add(section: str, series_id: str):
+    """Add a series id to a list section if not already present"""
+    with _LOCK:
+        data = _read()
+        if series_id not in data[section]:
+            data[section].append(series_id)
+            _write(data)
+
+
+def discard(section: str, series_id: str):
+    """Remove a series from a section (and its directory mapping for DICOM)"""
+    with _LOCK:
+        data = _read()
+        if section == "dicom_series":
+            data["dicom_series"] = [
+                s for s in data["dicom_series"] if s.get("series_uid") != series_id
+            ]
+            data["dicom_dirs"].pop(series_id, None)
+        else:
+            data[section] = [s for s in data[section] if s != series_id]
+        _write(data)
@@ -5,6 +5,7 @@ OPTIMIZED VERSION - Uses downsampling and simplified processing
 """
 
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Optional, List, Any
 import json
@@ -14,6 +15,17 @@ from scipy import ndimage
 from scipy.ndimage import zoom
 
 from app.config import settings
+from app.services import manifest
+from app.utils.kernels import assign_tissue_labels
+
+# Optional GPU path for the volume filters (install the cupy wheel
+# matching the local CUDA toolkit); scipy on the CPU is used unless
+# settings.USE_GPU is set and a CUDA device is present
+try:
+    import cupy
+    import cupyx.scipy.ndimage as cupy_ndimage
+except ImportError:
+    cupy = None
 from app.services.dicom_service import DicomService
 from app.services.analysis_service import AnalysisService
 
@@ -34,7 +46,8 @@ class ModelService:
     def clear_all_data(self):
         """Clear all cached model data"""
         self.model_cache.clear()
-    
+        manifest.update(model_series=[])
+
     def clear_series_data(self, series_id: str):
         """Alias for clear_model_for_series for API consistency"""
         self.clear_model_for_series(series_id)
@@ -51,19 +64,29 @@ class ModelService:
         info_path = settings.MODELS_DIR / f"{series_id}_model_info.json"
         
         for path in [glb_path, obj_path, info_path]:
-            if path.exists():
-                try:
-                    path.unlink()
-                except Exception:
-                    pass
-    
+            try:
+                path.unlink(missing_ok=True)
+            except Exception:
+                pass
+
+        manifest.discard("model_series", series_id)
+
     def scan_existing_data(self) -> List[str]:
         """Scan for existing model data and load into cache"""
+        # Fast path: the manifest lists generated models; the info JSON is
+        # lazy-loaded by get_model_info on first access
+        indexed = manifest.load()
+        if indexed and indexed.get("model_series"):
+            return [
+                series_id for series_id in indexed["model_series"]
+                if (settings.MODELS_DIR / f"{series_id}_model_info.json").exists()
+            ]
+
         loaded_models = []
-        
+
         if not settings.MODELS_DIR.exists():
             return loaded_models
-        
+
         for json_file in settings.MODELS_DIR.glob("*_model_info.json"):
             try:
                 with open(json_file, 'r') as f:
@@ -74,306 +97,52 @@ class ModelService:
                         loaded_models.append(series_id)
             except Exception:
                 continue
-        
+
+        manifest.update(model_series=loaded_models)
+
         return loaded_models
     
-    async def generate_model(
-        self, 
-        series_id: str, 
+    def generate_model(
+        self,
+        series_id: str,
         include_tissues: Optional[List[str]] = None
     ) -> Dict:
-        """Generate a 3D model from DICOM volume data - OPTIMIZED"""
-        
+        """Generate a 3D model from DICOM volume data (synchronous entrypoint)"""
+        volume, series_info = self.prepare_volume(series_id)
+        model_info = build_model(series_id, volume, series_info, include_tissues)
+        self.model_cache[series_id] = model_info
+        return model_info
+
+    def prepare_volume(self, series_id: str):
+        """Extract and validate the volume and series metadata for model generation
+
+        Runs in the parent process; the result can be shipped to an executor
+        worker, which cannot see the in-memory DICOM store.
+        """
         # Get volume data
         volume = self.dicom_service.get_volume_data(series_id)
         if volume is None:
             raise ValueError(f"Volume data not found for series: {series_id}")
-        
+
         # Check minimum volume requirements
         print(f"Volume shape: {volume.shape}")
         if volume.shape[0] < 3:
             raise ValueError(f"Not enough slices for 3D model (need at least 3, have {volume.shape[0]})")
         if volume.shape[1] < 10 or volume.shape[2] < 10:
             raise ValueError(f"Image dimensions too small for 3D model: {volume.shape[1]}x{volume.shape[2]}")
-        
+
         series_info = self.dicom_service.get_series_info(series_id)
         if series_info is None:
             raise ValueError(f"Series info not found: {series_id}")
-        
-        # Get voxel spacing
-        pixel_spacing = series_info.get("pixel_spacing", [1.0, 1.0])
-        slice_thickness = series_info.get("slice_thickness", 1.0) or 1.0
-        
-        px_y = float(pixel_spacing[0]) if pixel_spacing else 1.0
-        px_x = float(pixel_spacing[1]) if pixel_spacing else 1.0
-        sl_z = float(slice_thickness) * 0.55  # Balanced for good proportions
-        
-        avg_pixel_spacing = (px_x + px_y) / 2
-        if sl_z > avg_pixel_spacing * 1.5:
-            sl_z = avg_pixel_spacing
-        
-        # OPTIMIZATION: Downsample volumes aggressively for browser compatibility
-        downsample_factor = 1
-        max_dim = max(volume.shape)
-        target_max_dim = 128  # Aggressive target for browser memory limits
-        if max_dim > target_max_dim:
-            downsample_factor = max_dim / target_max_dim
-            
-            print(f"Downsampling volume by factor {downsample_factor:.1f}")
-            volume = zoom(volume, 1.0 / downsample_factor, order=1)
-            
-            # Adjust voxel spacing for downsampling
-            sl_z *= downsample_factor
-            px_y *= downsample_factor
-            px_x *= downsample_factor
-        
-        voxel_spacing = (sl_z, px_y, px_x)
-        
-        # Default tissues
-        if include_tissues is None:
-            include_tissues = ["body", "visceral_fat", "organs"]
-        
-        # Pre-compute normalized volume and body mask (shared across tissues)
-        # Match 2D analysis: normalize then smooth before thresholding
-        vol_min, vol_max = float(np.min(volume)), float(np.max(volume))
-        if vol_max - vol_min > 0:
-            normalized = ((volume - vol_min) / (vol_max - vol_min)).astype(np.float32)
-        else:
-            raise ValueError("Volume has no intensity variation")
-        
-        # Apply Gaussian smoothing like 2D analysis (sigma=1.0, scaled for downsampling)
-        smooth_sigma = max(0.5, 1.0 / downsample_factor)
-        normalized = ndimage.gaussian_filter(normalized, sigma=smooth_sigma)
-        
-        # Compute body mask using same threshold as 2D analysis (0.25, not 0.3)
-        from skimage import filters
-        threshold = filters.threshold_otsu(normalized)
-        body_mask = normalized > threshold * 0.25  # Match 2D analysis
-        body_mask = ndimage.binary_fill_holes(body_mask)
-        
-        # Pre-compute eroded body for fat separation
-        # Use 2D erosion slice-by-slice to match 2D analysis behavior
-        eroded_body = None
-        if "visceral_fat" in include_tissues or "subcutaneous_fat" in include_tissues:
-            # Scale erosion iterations based on downsampling
-            # 2D analysis uses 12 iterations on full resolution
-            # We need to scale down proportionally for downsampled volume
-            scaled_iterations = max(2, int(12 / downsample_factor))
-            print(f"Using {scaled_iterations} erosion iterations (scaled from 12 by factor {downsample_factor:.1f})")
-            
-            # Apply 2D erosion on each slice separately (like the 2D analysis does)
-            eroded_body = np.zeros_like(body_mask, dtype=bool)
-            for z in range(body_mask.shape[0]):
-                slice_eroded = ndimage.binary_erosion(body_mask[z], iterations=scaled_iterations)
-                slice_eroded = ndimage.binary_fill_holes(slice_eroded)
-                eroded_body[z] = slice_eroded
-            
-            # Safety check: if erosion removed too much, reduce iterations
-            eroded_volume_ratio = np.sum(eroded_body) / np.sum(body_mask) if np.sum(body_mask) > 0 else 0
-            print(f"Eroded body volume ratio: {eroded_volume_ratio:.2%}")
-            
-            if eroded_volume_ratio < 0.3:  # Less than 30% of body remaining
-                print("Erosion too aggressive, reducing iterations...")
-                scaled_iterations = max(1, scaled_iterations // 2)
-                eroded_body = np.zeros_like(body_mask, dtype=bool)
-                for z in range(body_mask.shape[0]):
-                    slice_eroded = ndimage.binary_erosion(body_mask[z], iterations=scaled_iterations)
-                    slice_eroded = ndimage.binary_fill_holes(slice_eroded)
-                    eroded_body[z] = slice_eroded
-                print(f"Reduced to {scaled_iterations} iterations, new ratio: {np.sum(eroded_body) / np.sum(body_mask):.2%}")
-        
-        # Compute percentiles once
-        body_pixels = normalized[body_mask]
-        if len(body_pixels) == 0:
-            raise ValueError("No body pixels found")
-        
-        scene = trimesh.Scene()
-        model_info = {
-            "series_id": series_id,
-            "tissues": [],
-            "slice_count": series_info.get("image_count", volume.shape[0]),
-            "dimensions": list(volume.shape),
-            "voxel_spacing": list(voxel_spacing)
-        }
-        
-        # Generate meshes with improved segmentation
-        # Use consistent thresholds matching the 2D analysis
-        p15 = np.percentile(body_pixels, 15)
-        p75 = np.percentile(body_pixels, 75)
-        
-        # FAT: Brightest regions (top 25%) - matches 2D analysis
-        fat_mask = (normalized >= p75) & body_mask
-        
-        # Clean up fat mask slice-by-slice like 2D analysis does
-        # (opening/closing with disk(2) equivalent, scaled for downsampling)
-        print(f"Fat mask before cleanup: {np.sum(fat_mask)} voxels")
-        for z in range(fat_mask.shape[0]):
-            # Light cleanup - just fill small holes, don't remove small features
-            fat_mask[z] = ndimage.binary_closing(fat_mask[z], iterations=1)
-        print(f"Fat mask after cleanup: {np.sum(fat_mask)} voxels")
-        
-        mesh_errors = []
-        
-        if "body" in include_tissues:
-            print(f"Generating body mesh... (mask voxels: {np.sum(body_mask)})")
-            mesh = self._generate_mesh_fast(body_mask, voxel_spacing, target_faces=5000)
-            if mesh:
-                mesh.visual.face_colors = [200, 200, 200, 255]  # Full alpha, opacity controlled by frontend
-                scene.add_geometry(mesh, node_name="body", geom_name="body")
-                model_info["tissues"].append({"name": "body", "color": "#C8C8C8", "opacity": 0.35})
-                print(f"  Body mesh: {len(mesh.faces)} faces")
-            else:
-                mesh_errors.append("body (no valid geometry)")
-        
-        if "visceral_fat" in include_tissues:
-            # Visceral fat: bright fat in the inner abdominal region
-            tissue_mask = fat_mask.copy()
-            if eroded_body is not None:
-                tissue_mask = tissue_mask & eroded_body
-            print(f"Generating visceral_fat mesh... (mask voxels: {np.sum(tissue_mask)})")
-            # keep_small_objects=True to preserve distributed fat deposits
-            mesh = self._generate_mesh_fast(tissue_mask, voxel_spacing, target_faces=8000, keep_small_objects=True)
-            if mesh:
-                mesh.visual.face_colors = [255, 165, 0, 255]  # Full alpha
-                scene.add_geometry(mesh, node_name="visceral_fat", geom_name="visceral_fat")
-                model_info["tissues"].append({"name": "visceral_fat", "color": "#FFA500", "opacity": 1.0})
-                print(f"  Visceral fat mesh: {len(mesh.faces)} faces")
-            else:
-                mesh_errors.append("visceral_fat (no valid geometry)")
-        
-        if "subcutaneous_fat" in include_tissues:
-            # Subcutaneous fat: bright fat in the outer ring (near skin)
-            tissue_mask = fat_mask.copy()
-            if eroded_body is not None:
-                tissue_mask = tissue_mask & ~eroded_body
-            print(f"Generating subcutaneous_fat mesh... (mask voxels: {np.sum(tissue_mask)})")
-            # keep_small_objects=True to preserve distributed fat deposits
-            mesh = self._generate_mesh_fast(tissue_mask, voxel_spacing, target_faces=8000, keep_small_objects=True)
-            if mesh:
-                mesh.visual.face_colors = [255, 255, 0, 255]  # Full alpha
-                scene.add_geometry(mesh, node_name="subcutaneous_fat", geom_name="subcutaneous_fat")
-                model_info["tissues"].append({"name": "subcutaneous_fat", "color": "#FFFF00", "opacity": 1.0})
-                print(f"  Subcutaneous fat mesh: {len(mesh.faces)} faces")
-            else:
-                mesh_errors.append("subcutaneous_fat (no valid geometry)")
-        
-        if "organs" in include_tissues:
-            # Organs (includes muscle): everything in the body that isn't fat
-            # Medium intensity regions (15th-75th percentile) - matches 2D analysis
-            tissue_mask = (normalized >= p15) & (normalized < p75) & body_mask
-            tissue_mask = tissue_mask & ~fat_mask  # Exclude fat
-            print(f"Generating organs mesh... (mask voxels: {np.sum(tissue_mask)})")
-            mesh = self._generate_mesh_fast(tissue_mask, voxel_spacing, target_faces=8000)
-            if mesh:
-                mesh.visual.face_colors = [0, 128, 255, 255]  # Full alpha
-                scene.add_geometry(mesh, node_name="organs", geom_name="organs")
-                model_info["tissues"].append({"name": "organs", "color": "#0080FF", "opacity": 1.0})
-                print(f"  Organs mesh: {len(mesh.faces)} faces")
-            else:
-                mesh_errors.append("organs (no valid geometry)")
-        
-        if len(scene.geometry) == 0:
-            error_detail = ", ".join(mesh_errors) if mesh_errors else "unknown reason"
-            raise ValueError(f"No meshes could be generated. Failed tissues: {error_detail}")
-        
-        # Export to GLB only (faster, skip OBJ)
-        glb_path = settings.MODELS_DIR / f"{series_id}_model.glb"
-        try:
-            scene.export(str(glb_path), file_type='glb')
-        except Exception as e:
-            print(f"GLB export failed: {e}")
-        
-        model_info["glb_path"] = str(glb_path) if glb_path.exists() else None
-        model_info["obj_path"] = None  # Skip OBJ for speed
-        
-        info_path = settings.MODELS_DIR / f"{series_id}_model_info.json"
-        with open(info_path, 'w') as f:
-            json.dump(model_info, f)
-        
-        self.model_cache[series_id] = model_info
-        return model_info
-    
-    def _generate_mesh_fast(
-        self, 
-        mask: np.ndarray, 
-        voxel_spacing: tuple,
-        target_faces: int = 10000,
-        keep_small_objects: bool = False
-    ) -> Optional[trimesh.Trimesh]:
-        """Mesh generation optimized for clean, smooth appearance"""
-        try:
-            total_voxels = np.sum(mask)
-            if total_voxels < 10:  # Need at least 10 voxels
-                print(f"  Skipping: only {total_voxels} voxels in mask")
-                return None
-            
-            # Step 1: Clean up the mask with morphological operations
-            # Skip opening for fat tissues (keep_small_objects=True) to preserve small deposits
-            if not keep_small_objects:
-                opening_iters = 1 if total_voxels > 2000 else 0
-                if opening_iters > 0:
-                    mask = ndimage.binary_opening(mask, iterations=opening_iters)
-            
-            # Fill small holes - use closing only for large tissues, not for scattered fat
-            if not keep_small_objects:
-                mask = ndimage.binary_closing(mask, iterations=1)
-            mask = ndimage.binary_fill_holes(mask)
-            
-            # Remove small disconnected objects (keep only larger regions)
-            # Skip entirely for fat tissues (keep_small_objects=True)
-            if not keep_small_objects:
-                labeled, num_features = ndimage.label(mask)
-                if num_features > 1:
-                    sizes = ndimage.sum(mask, labeled, range(1, num_features + 1))
-                    # Keep only objects larger than 0.5% of the largest (or 10 voxels minimum)
-                    max_size = np.max(sizes) if len(sizes) > 0 else 0
-                    min_size = max(10, max_size * 0.005)
-                    for i, size in enumerate(sizes, 1):
-                        if size < min_size:
-                            mask[labeled == i] = False
-            
-            remaining_voxels = np.sum(mask)
-            if remaining_voxels < 10:
-                print(f"  Skipping after cleanup: only {remaining_voxels} voxels remain")
-                return None
-            
-            # Step 2: Apply Gaussian smoothing to create smoother surfaces
-            # Use lighter smoothing for fat to preserve small features
-            smooth_sigma = 0.8 if keep_small_objects else 1.2
-            smoothed = ndimage.gaussian_filter(mask.astype(np.float32), sigma=smooth_sigma)
-            
-            # Step 3: Run marching cubes on the smoothed volume
-            verts, faces, normals, _ = measure.marching_cubes(
-                smoothed,
-                level=0.5,
-                spacing=voxel_spacing,
-                step_size=1  # Full resolution for smoother surface
-            )
-            
-            if len(faces) == 0:
-                return None
-            
-            mesh = trimesh.Trimesh(vertices=verts, faces=faces, vertex_normals=normals)
-            
-            # Step 4: Smooth the mesh vertices (Laplacian smoothing)
-            try:
-                # Apply Laplacian smoothing for even smoother appearance
-                trimesh.smoothing.filter_laplacian(mesh, iterations=2)
-            except Exception:
-                pass  # Continue without smoothing if it fails
-            
-            # Step 5: Simplify to target face count
-            if len(mesh.faces) > target_faces:
-                try:
-                    mesh = mesh.simplify_quadric_decimation(target_faces)
-                except Exception as e:
-                    print(f"Simplification failed: {e}")
-            
-            return mesh
-        except Exception as e:
-            print(f"Mesh generation failed: {e}")
-            return None
-    
+
+        return volume, series_info
+
+    def cache_model_info(self, model_info: Dict):
+        """Store model info produced by an executor worker"""
+        series_id = model_info.get("series_id")
+        if series_id:
+            self.model_cache[series_id] = model_info
+
     def get_model_path(self, series_id: str, format: str = "glb") -> Optional[str]:
         """Get the path to a generated model"""
         if format == "glb":
@@ -440,3 +209,502 @@ class ModelService:
                 })
         
         return models
+
+
+def _gpu_available() -> bool:
+    """Whether the cupy filter path is enabled and a CUDA device exists"""
+    if not settings.USE_GPU or cupy is None:
+        return False
+    try:
+        return cupy.cuda.runtime.getDeviceCount() > 0
+    except Exception:
+        return False
+
+
+# Per-worker cache of the volume preprocessing (zoom, normalize, Otsu,
+# erosion, classification), keyed by (series_id, pre-zoom shape). Pool
+# workers are long-lived, so regenerating a model with a different tissue
+# subset reuses the entry and goes straight to meshing. Single entry to
+# bound memory; a new series or re-upload simply evicts it.
+_volume_cache: Dict[Any, Dict[str, Any]] = {}
+
+
+def build_model(
+    series_id: str,
+    volume: np.ndarray,
+    series_info: Dict,
+    include_tissues: Optional[List[str]] = None
+) -> Dict:
+    """Build tissue meshes and export the GLB for an extracted volume - OPTIMIZED
+
+    Top-level (picklable) so it can run in a ProcessPoolExecutor worker.
+    """
+    pixel_spacing = series_info.get("pixel_spacing", [1.0, 1.0])
+    slice_thickness = series_info.get("slice_thickness", 1.0) or 1.0
+    
+    px_y = float(pixel_spacing[0]) if pixel_spacing else 1.0
+    px_x = float(pixel_spacing[1]) if pixel_spacing else 1.0
+    sl_z = float(slice_thickness) * 0.55  # Balanced for good proportions
+    
+    avg_pixel_spacing = (px_x + px_y) / 2
+    if sl_z > avg_pixel_spacing * 1.5:
+        sl_z = avg_pixel_spacing
+    
+    # Preprocessing is cached per worker, keyed by series and the pre-zoom
+    # shape, so regenerating with a different tissue subset (the common
+    # "toggle tissue" path) skips straight to meshing
+    cache_key = (series_id, volume.shape)
+    cached = _volume_cache.get(cache_key)
+
+    # OPTIMIZATION: Downsample volumes aggressively for browser compatibility
+    downsample_factor = 1
+    max_dim = max(volume.shape)
+    target_max_dim = 128  # Aggressive target for browser memory limits
+    if max_dim > target_max_dim:
+        downsample_factor = max_dim / target_max_dim
+
+        # Near-integer factors downsample by block averaging - one strided
+        # mean per output voxel instead of a full trilinear resample. The
+        # factor is snapped to the block size so the voxel-spacing
+        # adjustment below matches the actual reduction; snapping is only
+        # allowed when the reduced volume still fits the browser target,
+        # otherwise (and for fractional factors) trilinear zoom runs.
+        block = round(downsample_factor)
+        if (block > 1 and abs(block - downsample_factor) <= 0.25
+                and max_dim // block <= target_max_dim):
+            downsample_factor = float(block)
+            if cached is None:
+                print(f"Downsampling volume by factor {downsample_factor:.1f}")
+                # Crop to block multiples first - block_reduce zero-pads
+                # partial edge blocks, which would average real tissue
+                # with fabricated zero-intensity voxels
+                z, y, x = (dim - dim % block for dim in volume.shape)
+                volume = measure.block_reduce(
+                    volume[:z, :y, :x], (block, block, block), np.mean
+                ).astype(volume.dtype)
+        elif cached is None:
+            print(f"Downsampling volume by factor {downsample_factor:.1f}")
+            volume = zoom(volume, 1.0 / downsample_factor, order=1)
+
+        # Adjust voxel spacing for downsampling
+        sl_z *= downsample_factor
+        px_y *= downsample_factor
+        px_x *= downsample_factor
+
+    voxel_spacing = (sl_z, px_y, px_x)
+
+    # Default tissues
+    if include_tissues is None:
+        include_tissues = ["body", "visceral_fat", "organs"]
+
+    if cached is None:
+        cached = _classify_volume(volume, downsample_factor, sl_z, px_y, px_x)
+        _volume_cache.clear()
+        _volume_cache[cache_key] = cached
+
+    classes = cached["classes"]
+    body_mask = cached["body_mask"]
+    mesh_offset = cached["mesh_offset"]
+
+    scene = trimesh.Scene()
+    model_info = {
+        "series_id": series_id,
+        "tissues": [],
+        "include_tissues": sorted(include_tissues),
+        "slice_count": series_info.get("image_count", cached["dimensions"][0]),
+        "dimensions": cached["dimensions"],
+        "voxel_spacing": list(voxel_spacing)
+    }
+
+    mesh_errors = []
+
+    # (name, mask, target_faces, keep_small_objects, face_colors, color, opacity)
+    # keep_small_objects=True for fat to preserve distributed deposits
+    tissue_specs = []
+    if "body" in include_tissues:
+        tissue_specs.append(
+            ("body", body_mask, 5000, False, [200, 200, 200, 255], "#C8C8C8", 0.35))
+    if "visceral_fat" in include_tissues:
+        # Visceral fat: bright fat in the inner abdominal region
+        tissue_specs.append(
+            ("visceral_fat", classes == 1, 8000, True, [255, 165, 0, 255], "#FFA500", 1.0))
+    if "subcutaneous_fat" in include_tissues:
+        # Subcutaneous fat: bright fat in the outer ring (near skin)
+        tissue_specs.append(
+            ("subcutaneous_fat", classes == 2, 8000, True, [255, 255, 0, 255], "#FFFF00", 1.0))
+    if "organs" in include_tissues:
+        # Organs (includes muscle): body that isn't fat, 15th-75th percentile
+        tissue_specs.append(
+            ("organs", classes == 3, 8000, False, [0, 128, 255, 255], "#0080FF", 1.0))
+
+    for name, tissue_mask, *_ in tissue_specs:
+        print(f"Generating {name} mesh... (mask voxels: {np.sum(tissue_mask)})")
+
+    # The per-tissue pipelines (morphology + marching cubes + smoothing +
+    # decimation) are independent, and scipy/skimage release the GIL in
+    # their hot loops, so plain threads overlap them. build_model already
+    # runs inside a process-pool worker - nesting another process pool
+    # would mean pickling volume-sized masks for little gain.
+    with ThreadPoolExecutor(max_workers=len(tissue_specs) or 1) as pool:
+        meshes = list(pool.map(
+            # The body mask was hole-filled during preprocessing, so its
+            # mesh skips the redundant morphology cleanup
+            lambda spec: _generate_mesh_fast(
+                spec[1], voxel_spacing, target_faces=spec[2],
+                keep_small_objects=spec[3],
+                already_cleaned=spec[0] == "body", offset=mesh_offset
+            ),
+            tissue_specs
+        ))
+
+    for (name, _, _, _, face_colors, color, opacity), mesh in zip(tissue_specs, meshes):
+        if mesh:
+            mesh.visual.face_colors = face_colors  # Full alpha, opacity controlled by frontend
+            scene.add_geometry(mesh, node_name=name, geom_name=name)
+            model_info["tissues"].append({"name": name, "color": color, "opacity": opacity})
+            print(f"  {name} mesh: {len(mesh.faces)} faces")
+        else:
+            mesh_errors.append(f"{name} (no valid geometry)")
+    
+    if len(scene.geometry) == 0:
+        error_detail = ", ".join(mesh_errors) if mesh_errors else "unknown reason"
+        raise ValueError(f"No meshes could be generated. Failed tissues: {error_detail}")
+    
+    # Export to GLB only (faster, skip OBJ). Exporting to bytes and
+    # writing once avoids trimesh's incremental file writes.
+    glb_path = settings.MODELS_DIR / f"{series_id}_model.glb"
+    try:
+        data = scene.export(file_type='glb', include_normals=False)
+        with open(glb_path, 'wb') as f:
+            f.write(data)
+    except Exception as e:
+        print(f"GLB export failed: {e}")
+    
+    model_info["glb_path"] = str(glb_path) if glb_path.exists() else None
+    model_info["obj_path"] = None  # Skip OBJ for speed
+    
+    info_path = settings.MODELS_DIR / f"{series_id}_model_info.json"
+    with open(info_path, 'w') as f:
+        json.dump(model_info, f)
+    # The manifest entry is added by the caller in the parent process -
+    # manifest writes are serialized by a per-process lock, so a worker
+    # writing here could interleave with parent writes and drop updates
+
+    return model_info
+
+
+def _classify_volume(
+    volume: np.ndarray,
+    downsample_factor: float,
+    sl_z: float,
+    px_y: float,
+    px_x: float
+) -> Dict[str, Any]:
+    """Normalize, threshold and classify a (downsampled) volume
+
+    Returns everything the meshing phase of build_model needs; the result
+    is cached per worker in _volume_cache.
+    """
+    # Pre-compute normalized volume and body mask (shared across tissues)
+    # Match 2D analysis: normalize then smooth before thresholding
+    vol_min, vol_max = float(np.min(volume)), float(np.max(volume))
+    if vol_max - vol_min > 0:
+        normalized = ((volume - vol_min) / (vol_max - vol_min)).astype(np.float32)
+    else:
+        raise ValueError("Volume has no intensity variation")
+    
+    # Apply Gaussian smoothing like 2D analysis (sigma=1.0, scaled for downsampling)
+    smooth_sigma = max(0.5, 1.0 / downsample_factor)
+    if _gpu_available():
+        device_volume = cupy.asarray(normalized)
+        cupy_ndimage.gaussian_filter(device_volume, sigma=smooth_sigma, output=device_volume)
+        normalized = cupy.asnumpy(device_volume)
+    else:
+        normalized = ndimage.gaussian_filter(normalized, sigma=smooth_sigma)
+
+    # Quantize to uint8 after smoothing - 256 bins are plenty for Otsu and
+    # the percentile thresholds, and every later full-volume pass (otsu,
+    # percentiles, three comparisons) moves a quarter of the bytes
+    normalized = np.round(normalized * np.float32(255.0)).astype(np.uint8)
+
+    # Compute body mask using same threshold as 2D analysis (0.25, not 0.3)
+    from skimage import filters
+    threshold = filters.threshold_otsu(normalized)
+    body_mask = normalized > threshold * 0.25  # Match 2D analysis
+    body_mask = ndimage.binary_fill_holes(body_mask)
+
+    # Clean the body mask once here (opening, closing, small-component
+    # removal - the same sequence the body mesh used to run inside
+    # _generate_mesh_fast). Doing it before the crop keeps scanner table,
+    # arm and noise blobs out of the bounding box, the intensity
+    # histogram and the tissue classification, and makes the cached
+    # entry genuinely clean for every reuse
+    body_mask = ndimage.binary_opening(body_mask, iterations=1)
+    body_mask = ndimage.binary_closing(body_mask, iterations=1)
+    body_mask = ndimage.binary_fill_holes(body_mask)
+    labeled, num_features = ndimage.label(body_mask)
+    if num_features > 1:
+        # Keep only components larger than 0.5% of the largest (or 10
+        # voxels minimum), matching the per-mesh cleanup thresholds
+        sizes = np.bincount(labeled.ravel())
+        sizes[0] = 0
+        min_size = max(10, sizes.max() * 0.005)
+        keep = sizes >= min_size
+        body_mask = keep[labeled]
+
+    # Crop to the body's bounding box - every remaining pass is memory
+    # bound in the volume extent, and abdominal scans carry a wide
+    # air/padding margin. Mesh vertices get the offset added back so world
+    # coordinates still line up with the slice planes (model_info keeps
+    # the uncropped dimensions).
+    objects = ndimage.find_objects(body_mask.view(np.int8))
+    bbox = objects[0] if objects else None
+    if bbox is not None:
+        normalized = normalized[bbox]
+        body_mask = body_mask[bbox]
+        mesh_offset = (
+            bbox[0].start * sl_z,
+            bbox[1].start * px_y,
+            bbox[2].start * px_x
+        )
+    else:
+        mesh_offset = (0.0, 0.0, 0.0)
+
+    # Pre-compute eroded body for fat separation. Always computed (not
+    # just when a fat tissue is requested) so a cached entry serves any
+    # tissue subset; erosion is cheap next to the meshing it enables
+    # Use 2D erosion slice-by-slice to match 2D analysis behavior
+    # Scale erosion iterations based on downsampling
+    # 2D analysis uses 12 iterations on full resolution
+    # We need to scale down proportionally for downsampled volume
+    scaled_iterations = max(2, int(12 / downsample_factor))
+    print(f"Using {scaled_iterations} erosion iterations (scaled from 12 by factor {downsample_factor:.1f})")
+
+    # A flat (2D-in-3D) structuring element confines erosion and hole
+    # filling to each slice plane, so one 3D call per operation
+    # replaces the per-slice Python loop with identical output
+    strel_2d_in_3d = np.zeros((3, 3, 3), dtype=bool)
+    strel_2d_in_3d[1] = ndimage.generate_binary_structure(2, 1)
+
+    # Safety check up front: probe the middle slice (one slice's erosion
+    # costs ~1/Z of the full volume) and halve the iterations if it would
+    # remove too much of the body. This replaces the old erode-check-redo
+    # fallback, which doubled the work exactly on the slow path.
+    mid_slice = body_mask[body_mask.shape[0] // 2]
+    mid_total = np.sum(mid_slice)
+    if mid_total > 0:
+        mid_eroded = ndimage.binary_erosion(
+            mid_slice, iterations=scaled_iterations, border_value=0
+        )
+        if np.sum(mid_eroded) / mid_total < 0.3:  # Less than 30% remaining
+            print("Erosion too aggressive, reducing iterations...")
+            scaled_iterations = max(1, scaled_iterations // 2)
+
+    eroded_body = ndimage.binary_erosion(
+        body_mask, structure=strel_2d_in_3d,
+        iterations=scaled_iterations, border_value=0
+    )
+    eroded_body = ndimage.binary_fill_holes(eroded_body, structure=strel_2d_in_3d)
+    print(f"Eroded body volume ratio ({scaled_iterations} iterations): "
+          f"{np.sum(eroded_body) / max(1, np.sum(body_mask)):.2%}")
+
+    # Compute percentiles once
+    body_pixels = normalized[body_mask]
+    if len(body_pixels) == 0:
+        raise ValueError("No body pixels found")
+
+    # One linear bincount over the uint8 body voxels replaces the partial
+    # sorts np.percentile would run over the same millions-element array
+    hist = np.bincount(body_pixels, minlength=256)
+    cdf = np.cumsum(hist)
+    p15, p75 = np.searchsorted(cdf, np.array([0.15, 0.75]) * cdf[-1])
+    
+    # FAT: Brightest regions (top 25%) - matches 2D analysis
+    fat_mask = (normalized >= p75) & body_mask
+    
+    # Clean up fat mask slice-by-slice like 2D analysis does
+    # (opening/closing with disk(2) equivalent, scaled for downsampling)
+    print(f"Fat mask before cleanup: {np.sum(fat_mask)} voxels")
+    for z in range(fat_mask.shape[0]):
+        # Light cleanup - just fill small holes, don't remove small features
+        fat_mask[z] = ndimage.binary_closing(fat_mask[z], iterations=1)
+    print(f"Fat mask after cleanup: {np.sum(fat_mask)} voxels")
+
+    # One fused pass labels every voxel (same kernel as the 2D analysis);
+    # each per-tissue mask in build_model is then a single equality test
+    # instead of a chain of full-volume boolean temporaries
+    classes = assign_tissue_labels(normalized, body_mask, eroded_body,
+                                   fat_mask, p15, p75)
+
+    return {
+        "classes": classes,
+        "body_mask": body_mask,
+        "mesh_offset": mesh_offset,
+        "dimensions": list(volume.shape),
+    }
+
+
+def _generate_mesh_fast(
+    mask: np.ndarray,
+    voxel_spacing: tuple,
+    target_faces: int = 10000,
+    keep_small_objects: bool = False,
+    already_cleaned: bool = False,
+    offset: Optional[tuple] = None
+) -> Optional[trimesh.Trimesh]:
+    """Mesh generation optimized for clean, smooth appearance"""
+    try:
+        total_voxels = np.sum(mask)
+        if total_voxels < 10:  # Need at least 10 voxels
+            print(f"  Skipping: only {total_voxels} voxels in mask")
+            return None
+        
+        # Scratch buffers ping-pong through the morphology calls via
+        # output= so none of them allocates a fresh volume-sized array.
+        # Per call, not hoisted: the tissues run concurrently on threads.
+        scratch_b = np.empty(mask.shape, dtype=bool)
+
+        if already_cleaned:
+            # The caller's mask is already hole-filled and connected
+            # (e.g. the body mask from preprocessing) - skip straight to
+            # smoothing
+            remaining_voxels = total_voxels
+        else:
+            scratch_a = np.empty(mask.shape, dtype=bool)
+
+            # Step 1: Clean up the mask with morphological operations
+            # Skip opening for fat tissues (keep_small_objects=True) to preserve small deposits
+            if not keep_small_objects:
+                opening_iters = 1 if total_voxels > 2000 else 0
+                if opening_iters > 0:
+                    ndimage.binary_opening(mask, iterations=opening_iters, output=scratch_a)
+                    mask = scratch_a
+
+            # Fill small holes - use closing only for large tissues, not for scattered fat
+            if not keep_small_objects:
+                ndimage.binary_closing(mask, iterations=1, output=scratch_b)
+                mask = scratch_b
+            # fill_holes reads its input while dilating, so it must land in
+            # the buffer the mask does not currently occupy
+            ndimage.binary_fill_holes(mask, output=scratch_a)
+            mask = scratch_a
+
+            # Remove small disconnected objects (keep only larger regions)
+            # Skip entirely for fat tissues (keep_small_objects=True)
+            if not keep_small_objects:
+                labeled, num_features = ndimage.label(mask)
+                if num_features > 1:
+                    # Keep only objects larger than 0.5% of the largest (or 10
+                    # voxels minimum). One bincount gives every component size
+                    # and one table lookup rebuilds the mask, instead of a
+                    # full-volume `labeled == i` scan per component
+                    sizes = np.bincount(labeled.ravel())
+                    sizes[0] = 0
+                    min_size = max(10, sizes.max() * 0.005)
+                    keep = sizes >= min_size
+                    mask = keep[labeled]
+
+            remaining_voxels = np.sum(mask)
+            if remaining_voxels < 10:
+                print(f"  Skipping after cleanup: only {remaining_voxels} voxels remain")
+                return None
+        
+        # Confine smoothing and the isosurface scan to the tissue's
+        # bounding box plus a halo for the blur - scattered fat often
+        # occupies a small fraction of the volume. Vertices are shifted
+        # back after marching cubes.
+        objects = ndimage.find_objects(mask.view(np.int8))
+        window_offset = None
+        if objects:
+            pad = 3
+            window = tuple(
+                slice(max(0, s.start - pad), min(dim, s.stop + pad))
+                for s, dim in zip(objects[0], mask.shape)
+            )
+            mask = mask[window]
+            scratch_b = scratch_b[window]
+            window_offset = np.array(
+                [w.start * sp for w, sp in zip(window, voxel_spacing)]
+            )
+
+        # Step 2: Smooth before isosurfacing. Repeated 3x3x3 box filters
+        # converge on a Gaussian (three passes ~ the previous sigma=1.2,
+        # two ~ 0.8 for fat, which keeps lighter smoothing to preserve
+        # small features) but run on uint8 - integer ops at a quarter of
+        # the float32 bandwidth, indistinguishable at the level surface
+        box_passes = 2 if keep_small_objects else 3
+        smoothed = mask.view(np.uint8) * 255
+        if _gpu_available():
+            device_smoothed = cupy.asarray(smoothed)
+            for _ in range(box_passes):
+                cupy_ndimage.uniform_filter(device_smoothed, size=3, output=device_smoothed)
+            smoothed = cupy.asnumpy(device_smoothed)
+        else:
+            for _ in range(box_passes):
+                ndimage.uniform_filter(smoothed, size=3, output=smoothed)
+
+        # Step 3: Run marching cubes on the smoothed volume. For big solid
+        # tissues, sample coarsely enough that the generated face count
+        # lands near the decimation budget instead of emitting tens of
+        # thousands of triangles only to collapse them again. Fat keeps
+        # full resolution - step 2 would erase its scattered deposits.
+        if keep_small_objects:
+            step = 1
+        else:
+            step = max(1, min(2, int((remaining_voxels / target_faces) ** (1 / 3))))
+
+        # Restrict the isosurface scan to cells near the tissue: skimage
+        # skips cells outside `mask` entirely. A mostly-True mask costs
+        # more than it saves, so only pass one when the tissue is sparse.
+        ndimage.binary_dilation(mask, iterations=2, output=scratch_b)
+        evaluation_mask = scratch_b
+        if evaluation_mask.mean() >= 0.4:
+            evaluation_mask = None
+
+        verts, faces, _, _ = measure.marching_cubes(
+            smoothed,
+            level=127,
+            spacing=voxel_spacing,
+            step_size=step,
+            mask=evaluation_mask
+        )
+        
+        if len(faces) == 0:
+            return None
+
+        # Shift back into uncropped world coordinates: first undo the
+        # tissue bounding-box window, then the caller's body-crop offset
+        if window_offset is not None:
+            verts += window_offset.astype(verts.dtype)
+        if offset is not None:
+            verts += np.asarray(offset, dtype=verts.dtype)
+
+        # Marching-cubes normals would be stale after Laplacian smoothing
+        # and decimation anyway; leaving them off also keeps a NORMAL
+        # accessor (a third of the vertex data) out of the exported GLB.
+        # process=False skips the constructor's merge/validate passes -
+        # marching-cubes output is already well-formed.
+        mesh = trimesh.Trimesh(vertices=verts, faces=faces, process=False)
+        
+        # Step 4: Smooth the mesh vertices (Laplacian smoothing)
+        try:
+            # Apply Laplacian smoothing for even smoother appearance
+            trimesh.smoothing.filter_laplacian(mesh, iterations=2)
+        except Exception:
+            pass  # Continue without smoothing if it fails
+        
+        # Step 5: Simplify to target face count - but only when marching
+        # cubes overshot the budget enough for the edge collapse to pay
+        if len(mesh.faces) > target_faces * 1.5:
+            try:
+                mesh = mesh.simplify_quadric_decimation(target_faces)
+                # The only cleanup the unprocessed mesh actually needs:
+                # drop vertices the edge collapse orphaned
+                mesh.remove_unreferenced_vertices()
+            except Exception as e:
+                print(f"Simplification failed: {e}")
+        
+        return mesh
+    except Exception as e:
+        print(f"Mesh generation failed: {e}")
+        return None
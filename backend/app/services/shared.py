@@ -2,15 +2,20 @@
 Shared service instances to ensure data persistence across requests
 """
 
+from app.config import settings
 from app.services.dicom_service import DicomService
 from app.services.analysis_service import AnalysisService
 from app.services.model_service import ModelService
+from app.services.status_store import StatusStore
 
 # Create singleton instances
 dicom_service = DicomService()
 analysis_service = AnalysisService()
 model_service = ModelService()
 
+# Model generation status, shared across workers when Redis is configured
+generation_status = StatusStore(prefix="modelgen", ttl=settings.STATUS_TTL_SECONDS)
+
 # Wire up dependencies
 analysis_service.set_dicom_service(dicom_service)
 analysis_service.set_model_service(model_service)
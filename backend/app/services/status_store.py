@@ -0,0 +1,95 @@
+"""
+Generation status store
+Shares background-task status across workers with bounded memory
+"""
+
+import json
+import threading
+import time
+from typing import Dict, Optional
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+from app.config import settings
+
+
+class StatusStore:
+    """Key/value store for background task status with TTL eviction.
+
+    Uses Redis when settings.REDIS_URL is configured so multiple uvicorn
+    workers see the same state. Falls back to an in-process dict with TTL
+    eviction (the default for the single-process desktop deployment), so
+    memory stays bounded either way.
+    """
+
+    def __init__(self, prefix: str, ttl: int = 3600):
+        self.prefix = prefix
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._local: Dict[str, tuple] = {}  # key -> (expires_at, payload)
+        self._redis = None
+
+        if settings.REDIS_URL and redis is not None:
+            try:
+                self._redis = redis.Redis.from_url(settings.REDIS_URL)
+                self._redis.ping()
+            except Exception as e:
+                print(f"StatusStore: Redis unavailable ({e}), using in-process store")
+                self._redis = None
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def set(self, key: str, payload: dict):
+        """Store a status payload, refreshing its TTL"""
+        if self._redis is not None:
+            try:
+                self._redis.set(self._key(key), json.dumps(payload), ex=self.ttl)
+                return
+            except Exception:
+                pass  # Fall through to the local store
+
+        with self._lock:
+            self._evict_expired()
+            self._local[key] = (time.monotonic() + self.ttl, payload)
+
+    def get(self, key: str) -> Optional[dict]:
+        """Get a status payload, or None if missing or expired"""
+        if self._redis is not None:
+            try:
+                raw = self._redis.get(self._key(key))
+                return json.loads(raw) if raw is not None else None
+            except Exception:
+                pass
+
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if time.monotonic() > expires_at:
+                del self._local[key]
+                return None
+            return payload
+
+    def delete(self, key: str):
+        """Remove a status entry"""
+        if self._redis is not None:
+            try:
+                self._redis.delete(self._key(key))
+                return
+            except Exception:
+                pass
+
+        with self._lock:
+            self._local.pop(key, None)
+
+    def _evict_expired(self):
+        """Drop expired entries (caller must hold the lock)"""
+        now = time.monotonic()
+        expired = [k for k, (exp, _) in self._local.items() if now > exp]
+        for k in expired:
+            del self._local[k]
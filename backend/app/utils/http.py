@@ -0,0 +1,40 @@
+"""
+HTTP helpers for file-serving endpoints
+"""
+
+import os
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+
+# Generated PNGs/GLBs are rewritten in place on re-analysis, so clients must
+# revalidate - but a matching ETag collapses repeat fetches to empty 304s,
+# which is what matters for the slice-scrubbing workflow
+_CACHE_CONTROL = "public, no-cache"
+
+
+def conditional_file_response(
+    path: str,
+    request: Request,
+    media_type: str,
+    filename: Optional[str] = None
+) -> Response:
+    """Serve a file with ETag revalidation, returning 304 when unchanged"""
+    # Absolute path + precomputed stat let Starlette skip its own stat and
+    # hand the file straight to the server's sendfile path
+    path = os.path.abspath(path)
+    stat_result = os.stat(path)
+    etag = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+    headers = {"ETag": etag, "Cache-Control": _CACHE_CONTROL}
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(
+        path,
+        media_type=media_type,
+        filename=filename,
+        headers=headers,
+        stat_result=stat_result
+    )
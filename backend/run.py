@@ -2,6 +2,7 @@
 Server runner - handles both development and production (PyInstaller) modes
 """
 
+import multiprocessing
 import sys
 import uvicorn
 from app.config import settings
@@ -10,6 +11,9 @@ from app.config import settings
 IS_FROZEN = getattr(sys, 'frozen', False)
 
 if __name__ == "__main__":
+    # Required for ProcessPoolExecutor workers in the frozen build
+    multiprocessing.freeze_support()
+
     # Never use reload in frozen/packaged mode - it causes process spawning chaos
     use_reload = settings.DEBUG and not IS_FROZEN
     
@@ -23,9 +27,23 @@ if __name__ == "__main__":
     print(f"Port: {settings.API_PORT}")
     print(f"Reload: {use_reload}")
     
+    # uvloop/httptools ship with uvicorn[standard]; force them where they are
+    # supported instead of relying on "auto" detection (uvloop is not
+    # available on Windows). In the frozen build use "auto" instead: it
+    # still picks uvloop when the bundle includes it, but degrades to
+    # asyncio rather than crashing at startup when it doesn't.
+    if sys.platform == "win32":
+        loop_impl = "asyncio"
+    elif IS_FROZEN:
+        loop_impl = "auto"
+    else:
+        loop_impl = "uvloop"
+
     uvicorn.run(
         "app.main:app",
         host=settings.API_HOST,
         port=settings.API_PORT,
-        reload=use_reload
+        reload=use_reload,
+        loop=loop_impl,
+        http="httptools"
     )
@@ -26,6 +26,7 @@ a = Analysis(
         'fastapi',
         'fastapi.middleware',
         'fastapi.middleware.cors',
+        'fastapi.middleware.gzip',
         'fastapi.staticfiles',
         'fastapi.templating',
         'fastapi.responses',
@@ -43,6 +44,10 @@ a = Analysis(
         'uvicorn.loops',
         'uvicorn.loops.auto',
         'uvicorn.loops.asyncio',
+        # uvloop comes in via uvicorn[standard] on macOS/Linux; bundle it so
+        # the "auto" loop keeps the fast event loop in the frozen build
+        'uvicorn.loops.uvloop',
+        'uvloop',
         'uvicorn.protocols',
         'uvicorn.protocols.http',
         'uvicorn.protocols.http.auto',
@@ -66,6 +71,7 @@ a = Analysis(
         'starlette.requests',
         'starlette.middleware',
         'starlette.middleware.cors',
+        'starlette.middleware.gzip',
         'starlette.middleware.base',
         'starlette.middleware.errors',
         'starlette.middleware.exceptions',
@@ -168,6 +174,24 @@ a = Analysis(
         'trimesh.grouping',
         'trimesh.util',
         
+        # JSON serialization (orjson is a hard import via the manifest;
+        # msgspec is optional with an orjson fallback but should ship so the
+        # frozen build keeps the faster analysis encoding)
+        'orjson',
+        'msgspec',
+        'msgspec.json',
+
+        # JIT-compiled segmentation kernels (optional, NumPy fallback built
+        # in - bundle them so the frozen build keeps the compiled path).
+        # libarchive and redis are deliberately NOT bundled: per
+        # requirements.txt their fallbacks (stdlib zipfile, in-process status
+        # store) are the intended behavior in the packaged desktop build.
+        'numba',
+        'numba.core',
+        'numba.np.ufunc',
+        'llvmlite',
+        'llvmlite.binding',
+
         # Async and IO
         'aiofiles',
         'aiofiles.os',